@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
 import models, schemas
 import uuid
+import json
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import or_, func, inspect, text
 
 # --- YARDIMCI FONKSİYON: GÜVENLİ TARİH ÇEVİRİCİ ---
 def safe_parse_date(date_val):
@@ -75,15 +76,51 @@ def create_property(db: Session, prop: schemas.PropertyCreate):
     db.refresh(db_prop)
     return db_prop
 
+def _config_option_ids(config):
+    # config = {"options": [{"id": ..., "name": ..., "color": ...}, ...]}
+    if not config:
+        return set()
+    return {opt.get("id") for opt in config.get("options") or [] if isinstance(opt, dict)}
+
 def update_property(db: Session, prop_id: str, updates: schemas.PropertyUpdate):
     db_prop = db.query(models.Property).filter(models.Property.id == prop_id).first()
     if not db_prop: return None
-    for k, v in updates.dict(exclude_unset=True).items(): setattr(db_prop, k, v)
+    data = updates.dict(exclude_unset=True)
+    if "config" in data:
+        # Config'den silinen seçenekler tüm sayfalardan tek sorguda kaldırılır
+        removed = _config_option_ids(db_prop.config) - _config_option_ids(data["config"])
+        if removed:
+            remove_property_options(db, prop_id, removed)
+    for k, v in data.items(): setattr(db_prop, k, v)
     db.commit()
     db.refresh(db_prop)
     return db_prop
 
+def remove_property_options(db: Session, prop_id: str, option_ids):
+    # Commit çağırana bırakılır (update_property ile aynı transaction)
+    return db.query(models.ValueOption).filter(
+        models.ValueOption.property_id == prop_id,
+        models.ValueOption.option_id.in_(list(option_ids))
+    ).delete(synchronize_session=False)
+
+def count_property_options(db: Session, prop_id: str):
+    # Her seçeneğin kaç sayfada kullanıldığı: {option_id: adet}
+    rows = db.query(models.ValueOption.option_id, func.count(models.ValueOption.id)).filter(
+        models.ValueOption.property_id == prop_id
+    ).group_by(models.ValueOption.option_id).all()
+    return {option_id: count for option_id, count in rows}
+
+def get_pages_with_option(db: Session, prop_id: str, option_id: str):
+    # "X etiketli sayfalar" - value_options indeksi üzerinden
+    return db.query(models.Page).join(models.Value, models.Value.page_id == models.Page.id).join(
+        models.ValueOption, models.ValueOption.value_id == models.Value.id
+    ).filter(
+        models.ValueOption.property_id == prop_id,
+        models.ValueOption.option_id == option_id
+    ).distinct().all()
+
 def delete_property(db: Session, prop_id: str):
+    db.query(models.ValueOption).filter(models.ValueOption.property_id == prop_id).delete(synchronize_session=False)
     db.query(models.Property).filter(models.Property.id == prop_id).delete()
     db.commit()
     return True
@@ -126,6 +163,9 @@ def update_page(db: Session, page_id: str, updates: schemas.PageUpdate):
     return db_page
 
 def delete_page(db: Session, page_id: str):
+    # Toplu silme ORM cascade'ini tetiklemez; seçenek üyeliklerini sayımlarda kalmasın diye elle temizle
+    value_ids = db.query(models.Value.id).filter(models.Value.page_id == page_id)
+    db.query(models.ValueOption).filter(models.ValueOption.value_id.in_(value_ids.scalar_subquery())).delete(synchronize_session=False)
     db.query(models.Page).filter(models.Page.id == page_id).delete()
     db.commit()
     return True
@@ -140,6 +180,21 @@ def get_property_value(db: Session, page_id: str, property_id: str):
 def get_page_values(db: Session, page_id: str):
     return db.query(models.Value).filter(models.Value.page_id == page_id).all()
 
+def _set_value_options(db_value, option_ids, is_multi: bool):
+    # Sadece ilgili türdeki (select ya da multi_select) üyelikler değiştirilir
+    db_value.options = [o for o in db_value.options if o.is_multi != is_multi]
+    seen = set()
+    for position, option_id in enumerate(option_ids):
+        if not option_id or option_id in seen:
+            continue
+        seen.add(option_id)
+        db_value.options.append(models.ValueOption(
+            property_id=db_value.property_id,
+            option_id=option_id,
+            is_multi=is_multi,
+            position=position
+        ))
+
 def set_property_value(db: Session, value_data: schemas.PropertyValueSet):
     # Önce bu sayfa ve özellik için var olan bir değer var mı bakalım
     db_value = db.query(models.Value).filter(
@@ -177,10 +232,10 @@ def set_property_value(db: Session, value_data: schemas.PropertyValueSet):
         db_value.checked = val['checked']
         
     if 'option_id' in val: 
-        db_value.option_id = val['option_id']
+        _set_value_options(db_value, [val['option_id']], is_multi=False)
         
     if 'option_ids' in val: 
-        db_value.option_ids = val['option_ids']
+        _set_value_options(db_value, val['option_ids'] or [], is_multi=True)
     
     db.commit()
     db.refresh(db_value)
@@ -228,4 +283,53 @@ def search_everything(db: Session, query: str):
             "database_id": page.database_id # Eğer bir veritabanına bağlıysa oraya gitsin
         })
 
-    return results
\ No newline at end of file
+    return results
+
+# =======================
+# ESKİ VERİ TAŞIMA (values.option_id / values.option_ids -> value_options)
+# =======================
+
+def migrate_legacy_option_values(db: Session):
+    """
+    Eski sürümlerde seçenekler values tablosunda (option_id + JSON option_ids) tutuluyordu.
+    Bu sütunlar hâlâ varsa verileri value_options tablosuna taşır ve sütunları kaldırır.
+    Sütunlar yoksa hiçbir şey yapmaz, her açılışta güvenle çağrılabilir.
+    """
+    columns = {c["name"] for c in inspect(db.get_bind()).get_columns("values")}
+    legacy = [c for c in ("option_id", "option_ids") if c in columns]
+    if not legacy:
+        return
+
+    rows = db.execute(text(
+        f'SELECT id, property_id, {", ".join(legacy)} FROM "values"'
+    )).mappings().all()
+
+    new_rows = []
+    for row in rows:
+        if row.get("option_id"):
+            new_rows.append({
+                "value_id": row["id"], "property_id": row["property_id"],
+                "option_id": row["option_id"], "is_multi": False, "position": 0
+            })
+        option_ids = row.get("option_ids")
+        if isinstance(option_ids, str):
+            try:
+                option_ids = json.loads(option_ids)
+            except ValueError:
+                option_ids = None
+        seen = set()
+        for position, option_id in enumerate(option_ids or []):
+            if not option_id or option_id in seen:
+                continue
+            seen.add(option_id)
+            new_rows.append({
+                "value_id": row["id"], "property_id": row["property_id"],
+                "option_id": option_id, "is_multi": True, "position": position
+            })
+
+    if new_rows:
+        db.execute(models.ValueOption.__table__.insert(), new_rows)
+    for column in legacy:
+        db.execute(text(f'ALTER TABLE "values" DROP COLUMN {column}'))
+    db.commit()
+    print(f"BİLGİ: {len(new_rows)} seçenek kaydı value_options tablosuna taşındı.")
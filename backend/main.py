@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 import models
 import schemas
 import crud
-from database import engine, get_db
+from database import engine, get_db, SessionLocal
 import shutil
 import os
 import sys
@@ -32,6 +32,10 @@ DIST_DIR = os.path.join(RESOURCE_DIR, "static")
 
 models.Base.metadata.create_all(bind=engine)
 
+# Eski JSON seçenek sütunları varsa value_options tablosuna taşı
+with SessionLocal() as _db:
+    crud.migrate_legacy_option_values(_db)
+
 app = FastAPI(title="Notion Clone API", version="1.0.0")
 
 app.add_middleware(
@@ -113,6 +117,14 @@ def delete_property(property_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Property not found")
     return {"message": "Property deleted"}
 
+@app.get("/properties/{property_id}/option-counts", response_model=dict[str, int])
+def get_option_counts(property_id: str, db: Session = Depends(get_db)):
+    return crud.count_property_options(db, property_id)
+
+@app.get("/properties/{property_id}/options/{option_id}/pages", response_model=list[schemas.PageResponse])
+def list_pages_with_option(property_id: str, option_id: str, db: Session = Depends(get_db)):
+    return crud.get_pages_with_option(db, property_id, option_id)
+
 @app.post("/pages", response_model=schemas.PageResponse)
 def create_page(page: schemas.PageCreate, db: Session = Depends(get_db)):
     return crud.create_page(db, page)
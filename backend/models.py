@@ -1,7 +1,8 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from database import Base
 import datetime
+import builtins
 
 class Database(Base):
     __tablename__ = "databases"
@@ -47,8 +48,43 @@ class Value(Base):
     date = Column(DateTime, nullable=True)
     end_date = Column(DateTime, nullable=True) # YENİ
     checked = Column(Boolean, default=False)
-    option_id = Column(String, nullable=True)
-    option_ids = Column(JSON, nullable=True)
+
+    # Seçenek üyelikleri (select / multi_select) ayrı tabloda tutulur: value_options
+    options = relationship(
+        "ValueOption",
+        back_populates="value",
+        cascade="all, delete-orphan",
+        order_by="ValueOption.position",
+        lazy="selectin",
+    )
     
     page = relationship("Page", back_populates="values")
-    property = relationship("Property", back_populates="values")
\ No newline at end of file
+    property = relationship("Property", back_populates="values")
+
+    # API şekli değişmesin diye eski alan isimleri okunabilir olarak kalıyor
+    # (sınıf içinde "property" ilişkisi builtin'i gölgelediği için builtins.property)
+    @builtins.property
+    def option_id(self):
+        return next((o.option_id for o in self.options if not o.is_multi), None)
+
+    @builtins.property
+    def option_ids(self):
+        ids = [o.option_id for o in self.options if o.is_multi]
+        return ids or None
+
+class ValueOption(Base):
+    __tablename__ = "value_options"
+    id = Column(Integer, primary_key=True, index=True)
+    value_id = Column(Integer, ForeignKey("values.id", ondelete="CASCADE"), nullable=False, index=True)
+    # property_id bilinçli olarak tekrar tutuluyor: filtre ve sayım sorguları join'siz indeksten çalışsın
+    property_id = Column(String, ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
+    option_id = Column(String, nullable=False)
+    is_multi = Column(Boolean, default=False, nullable=False) # False: select/status, True: multi_select
+    position = Column(Integer, default=0, nullable=False) # multi_select sırası
+
+    value = relationship("Value", back_populates="options")
+
+    __table_args__ = (
+        Index("ix_value_options_property_option", "property_id", "option_id"),
+        Index("ix_value_options_option", "option_id"),
+    )
\ No newline at end of file